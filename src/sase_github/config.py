@@ -1,14 +1,30 @@
 """GitHub configuration helpers."""
 
+import functools
+from typing import Any
+
 from sase.config import load_merged_config
 
 
+@functools.lru_cache(maxsize=1)
+def _merged_config() -> dict[str, Any]:
+    """Load the merged sase config once per process.
+
+    ``load_merged_config`` walks the filesystem and parses every config
+    layer; the result is stable for the lifetime of the process.
+    """
+    return load_merged_config()
+
+
+@functools.lru_cache(maxsize=1)
 def get_github_username() -> str | None:
     """Read ``github_username`` from the merged sase config.
 
+    Memoized: callers hit this on per-clone and per-submit paths, and
+    the answer never changes within a process.
+
     Returns:
         The configured GitHub username, or ``None`` if not set.
     """
-    config = load_merged_config()
-    value = config.get("github_username")
+    value = _merged_config().get("github_username")
     return str(value) if value else None
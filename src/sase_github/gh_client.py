@@ -0,0 +1,231 @@
+"""Pooled GitHub REST API client.
+
+Replaces per-call ``gh pr view`` subprocesses — each of which pays fork,
+auth, and TLS-handshake overhead — with direct ``api.github.com`` requests
+over a single connection-pooled HTTP client shared for the lifetime of the
+process.
+"""
+
+import atexit
+import functools
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+
+_REMOTE_URL_PATTERN = re.compile(
+    r"(?:github\.com[:/])(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?/?$"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _git_exe() -> str:
+    """Absolute path of the git binary, resolved once."""
+    return shutil.which("git") or "git"
+
+
+def _run_git(args: list[str], cwd: str) -> str | None:
+    """Run git against *cwd* and return stripped stdout, or ``None``.
+
+    Spawn-friendly shape: an absolute executable path, ``git -C``
+    instead of ``cwd=``, and ``close_fds=False`` let CPython's
+    posix_spawn fast path engage instead of forking the whole
+    interpreter heap (all Python-created fds are CLOEXEC per PEP 446,
+    so nothing leaks to git).
+    """
+    try:
+        result = subprocess.run(
+            [_git_exe(), "-C", cwd, *args],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=10,
+            close_fds=False,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    out = result.stdout.strip()
+    return out or None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_token() -> str | None:
+    """Resolve a GitHub API token, preferring ``GITHUB_TOKEN``.
+
+    Falls back to ``gh auth token`` so existing ``gh``-based logins keep
+    working. Cached for the lifetime of the process.
+    """
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    try:
+        result = subprocess.run(
+            ["gh", "auth", "token"],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=10,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    token = result.stdout.strip()
+    return token or None
+
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> httpx.Client:
+    """Return the shared connection-pooled GitHub API client.
+
+    Created lazily on first use and kept alive for the whole process so
+    every lookup after the first reuses the authenticated, already
+    handshaken connections; closed cleanly at interpreter exit.
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    token = _get_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    client = httpx.Client(
+        base_url="https://api.github.com",
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        headers=headers,
+        timeout=30,
+    )
+    atexit.register(client.close)
+    return client
+
+
+@functools.lru_cache(maxsize=1024)
+def get_repo_info(cwd: str) -> tuple[str, str] | None:
+    """Return ``(owner, repo)`` parsed from the origin URL of *cwd*.
+
+    Cached per directory — the origin remote is stable for the lifetime
+    of a workspace.
+    """
+    url = _run_git(["config", "--get", "remote.origin.url"], cwd)
+    if url is None:
+        return None
+    match = _REMOTE_URL_PATTERN.search(url)
+    if match is None:
+        return None
+    return (match.group("owner"), match.group("repo"))
+
+
+def _read_git_head(cwd: str) -> tuple[str | None, str | None]:
+    """Return ``(branch, sha)`` by reading ``.git`` files directly.
+
+    Two small file reads replace a git fork for the common layouts:
+    ``HEAD`` pointing at a loose ref, a ref packed into ``packed-refs``,
+    or a detached HEAD. Returns ``(None, None)`` when ``.git`` can't be
+    read this way (e.g. a worktree gitfile) so callers can fall back to
+    the git CLI.
+    """
+    git_dir = os.path.join(cwd, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return (None, None)
+
+    if not head.startswith("ref: "):
+        # Detached HEAD stores the SHA inline.
+        return (None, head if re.fullmatch(r"[0-9a-f]{40}", head) else None)
+
+    ref = head.removeprefix("ref: ")
+    branch = ref.removeprefix("refs/heads/") if ref.startswith("refs/heads/") else None
+    try:
+        with open(os.path.join(git_dir, *ref.split("/")), encoding="utf-8") as f:
+            sha = f.read().strip()
+            return (branch, sha or None)
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return (branch, sha)
+    except OSError:
+        pass
+    return (branch, None)
+
+
+def get_current_branch(cwd: str) -> str | None:
+    """Return the current branch name in *cwd*, or ``None`` on failure."""
+    branch, _ = _read_git_head(cwd)
+    if branch:
+        return branch
+    return _run_git(["rev-parse", "--abbrev-ref", "HEAD"], cwd)
+
+
+def _get_head_sha(cwd: str) -> str | None:
+    """Return the HEAD commit SHA in *cwd*, or ``None`` on failure."""
+    _, sha = _read_git_head(cwd)
+    if sha:
+        return sha
+    return _run_git(["rev-parse", "HEAD"], cwd)
+
+
+def lookup_open_pr(cwd: str) -> dict[str, Any] | None:
+    """Return the open PR for the current branch of *cwd*, if any.
+
+    Queries ``GET /repos/{owner}/{repo}/pulls`` filtered by head branch
+    over the pooled client. Returns the raw PR JSON object (``number``,
+    ``html_url``, ...) or ``None`` when no PR exists or the lookup fails.
+
+    Results are memoized per ``(cwd, branch, HEAD sha)`` so a
+    mail+classify sequence — PR probe, then change URL, then CL number —
+    costs one API round-trip instead of three; a new commit or checkout
+    invalidates the entry naturally by changing the key.
+    """
+    # The branch and HEAD probes are independent git forks; overlap them.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        branch_future = executor.submit(get_current_branch, cwd)
+        sha_future = executor.submit(_get_head_sha, cwd)
+        branch = branch_future.result()
+        head_sha = sha_future.result()
+    return _lookup_open_pr_cached(cwd, branch, head_sha)
+
+
+def invalidate_pr_lookup() -> None:
+    """Drop memoized PR lookups after a PR is created out of band.
+
+    ``gh pr create`` changes the answer without changing the
+    ``(cwd, branch, HEAD sha)`` key, so the cached ``None`` would
+    otherwise stick for the rest of the process. ``lru_cache`` has no
+    keyed delete; a full clear is cheap at this size.
+    """
+    _lookup_open_pr_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _lookup_open_pr_cached(
+    cwd: str, branch: str | None, head_sha: str | None
+) -> dict[str, Any] | None:
+    repo_info = get_repo_info(cwd)
+    if repo_info is None or branch is None:
+        return None
+    owner, repo = repo_info
+    try:
+        response = get_client().get(
+            f"/repos/{owner}/{repo}/pulls",
+            params={"head": f"{owner}:{branch}", "state": "open"},
+        )
+        response.raise_for_status()
+        pulls = response.json()
+    except (httpx.HTTPError, ValueError):
+        return None
+    if not pulls:
+        return None
+    pr: dict[str, Any] = pulls[0]
+    return pr
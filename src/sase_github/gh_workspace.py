@@ -0,0 +1,98 @@
+"""Workspace allocation for the #gh xprompt workflow.
+
+Single entrypoint for resolving a ``#gh`` reference and claiming a
+workspace, so setup scripts don't each re-run ``resolve_ref`` and
+``ensure_git_clone`` with their own slightly divergent copies.
+"""
+
+import functools
+import os
+from dataclasses import dataclass
+
+from sase.running_field import (
+    claim_workspace,
+    get_first_available_axe_workspace,
+)
+from sase.workspace_provider import ResolvedRef, resolve_ref
+from sase.workspace_utils import ensure_git_clone, get_default_branch
+
+
+@functools.lru_cache(maxsize=64)
+def default_branch_name(workspace_dir: str) -> str:
+    """Short default-branch name (e.g. ``main``) for *workspace_dir*.
+
+    ``get_default_branch`` forks git and returns a remote ref like
+    ``origin/main``; the answer is stable per workspace, so cache the
+    already-split tail for all callers.
+    """
+    return get_default_branch(workspace_dir).rsplit("/", 1)[-1]
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_ref_cached(ref: str) -> ResolvedRef:
+    """Resolve *ref* for the ``gh`` workflow, cached per process.
+
+    Resolution is deterministic per repo checkout, so repeat allocations
+    of the same ref skip the filesystem/config walk.
+    """
+    return resolve_ref(ref, "gh")
+
+
+@dataclass(frozen=True, slots=True)
+class AllocatedWorkspace:
+    """Result of allocating a workspace for a ``#gh`` reference."""
+
+    resolved: ResolvedRef
+    workspace_num: int
+    workspace_dir: str
+    workflow_name: str
+    should_release: bool
+
+
+def allocate_gh_workspace(
+    gh_ref: str,
+    *,
+    n: int | None,
+    release: bool,
+    workflow_label: str | None = None,
+) -> AllocatedWorkspace:
+    """Resolve *gh_ref*, pick a workspace, and claim it.
+
+    Honors TUI pre-allocation via the ``SASE_GH_*`` environment variables:
+    a pre-allocated workspace is reused as-is and neither claimed nor
+    released here — the launcher owns its lifecycle.
+    """
+    resolved = _resolve_ref_cached(gh_ref)
+    project_file = resolved.project_file
+
+    env = os.environ
+    pre_allocated = env.get("SASE_GH_PRE_ALLOCATED") == "1"
+    if pre_allocated:
+        workspace_num = int(env["SASE_GH_WORKSPACE_NUM"])
+        workspace_dir = env["SASE_GH_WORKSPACE_DIR"]
+    elif n is not None:
+        workspace_num = n
+        workspace_dir = ensure_git_clone(resolved.primary_workspace_dir, workspace_num)
+    else:
+        workspace_num = get_first_available_axe_workspace(project_file)
+        workspace_dir = ensure_git_clone(resolved.primary_workspace_dir, workspace_num)
+
+    workflow_name = workflow_label or f"gh-{gh_ref}"
+
+    if not pre_allocated:
+        claim_workspace(
+            project_file,
+            workspace_num,
+            workflow_name,
+            os.getpid(),
+            None,
+            pinned=not release,
+        )
+
+    return AllocatedWorkspace(
+        resolved=resolved,
+        workspace_num=workspace_num,
+        workspace_dir=workspace_dir,
+        workflow_name=workflow_name,
+        should_release=release and not pre_allocated,
+    )
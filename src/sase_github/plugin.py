@@ -3,67 +3,131 @@
 Handles git repositories hosted on GitHub (or similar hosted services).
 Inherits shared git operations from :class:`GitCommon` and adds
 GitHub-specific methods (``mail`` with PR creation, ``get_cl_number``
-and ``get_change_url`` via ``gh`` CLI).
+and ``get_change_url`` via the pooled REST client).
 """
 
+import functools
+import os
+import re
 import subprocess
 
 from sase.vcs_provider._hookspec import hookimpl
 from sase.vcs_provider.plugins._git_common import GitCommon
 
+from sase_github import gh_client
 
-class GitHubPlugin(GitCommon):
-    """Pluggy plugin for GitHub-hosted git repositories."""
+_GITHUB_REMOTE_PATTERN = re.compile(rb"url\s*=.*github\.com")
 
-    @hookimpl
-    def vcs_classify_repo(self, git_dir: str) -> str | None:
-        """Claim repos with ``github.com`` in their origin URL."""
+
+def _find_git_config(git_dir: str) -> str | None:
+    """Locate the git config file for *git_dir*, if readable directly.
+
+    Handles *git_dir* being either the worktree root or the ``.git``
+    directory itself, and follows a one-level ``gitdir:`` pointer for
+    linked worktrees. ``.git/config`` is checked first: a worktree root
+    may contain an ordinary tracked file named ``config``, so the bare
+    ``<git_dir>/config`` only counts when a sibling ``HEAD`` marks
+    *git_dir* as an actual git dir. Returns ``None`` when no config
+    file is found.
+    """
+    candidate = os.path.join(git_dir, ".git", "config")
+    if os.path.isfile(candidate):
+        return candidate
+    gitfile = os.path.join(git_dir, ".git")
+    if os.path.isfile(gitfile):
         try:
-            result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                cwd=git_dir,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=10,
-            )
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            with open(gitfile, encoding="utf-8") as f:
+                pointer = f.readline().strip()
+        except OSError:
             return None
+        if pointer.startswith("gitdir: "):
+            candidate = os.path.join(pointer.removeprefix("gitdir: "), "config")
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+    candidate = os.path.join(git_dir, "config")
+    if os.path.isfile(candidate) and os.path.isfile(os.path.join(git_dir, "HEAD")):
+        return candidate
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_git_dir(git_dir: str) -> str | None:
+    """Classify *git_dir* by its origin URL, cached per real path.
 
-        if result.returncode != 0:
+    Pluggy re-runs classifier plugins for every workspace discovery, so
+    the same directory would otherwise be probed with a fresh ``git
+    config`` fork each time; the answer is stable per directory.
+
+    The classifier only needs substring detection, so the config file is
+    read and regex-matched directly — one open+read instead of a
+    fork+exec with a 10s timeout. The subprocess path remains as a
+    fallback for layouts without a readable config file.
+    """
+    config_path = _find_git_config(git_dir)
+    if config_path is not None:
+        try:
+            with open(config_path, "rb") as f:
+                data = f.read(8192)
+        except OSError:
             return None
+        return "github" if _GITHUB_REMOTE_PATTERN.search(data) else None
+
+    try:
+        # Bytes output: the URL is only substring-checked, so skip the
+        # UTF-8 decode and strip allocation entirely.
+        result = subprocess.run(
+            ["git", "config", "--get", "remote.origin.url"],
+            cwd=git_dir,
+            capture_output=True,
+            check=False,
+            timeout=10,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
 
-        url = result.stdout.strip()
-        if "github.com" in url:
-            return "github"
+    if result.returncode != 0:
         return None
 
+    if b"github.com" in result.stdout:
+        return "github"
+    return None
+
+
+class GitHubPlugin(GitCommon):
+    """Pluggy plugin for GitHub-hosted git repositories."""
+
+    @hookimpl
+    def vcs_classify_repo(self, git_dir: str) -> str | None:
+        """Claim repos with ``github.com`` in their origin URL."""
+        return _classify_git_dir(os.path.realpath(git_dir))
+
     @hookimpl
     def vcs_get_change_url(self, cwd: str) -> tuple[bool, str | None]:
-        out = self._run(["gh", "pr", "view", "--json", "url", "-q", ".url"], cwd)
-        if out.success:
-            url = out.stdout.strip()
-            return (True, url) if url else (True, None)
+        pr = gh_client.lookup_open_pr(cwd)
+        if pr and pr.get("html_url"):
+            return (True, str(pr["html_url"]))
         return (True, None)
 
     @hookimpl
     def vcs_get_cl_number(self, cwd: str) -> tuple[bool, str | None]:
-        out = self._run(["gh", "pr", "view", "--json", "number", "-q", ".number"], cwd)
-        if out.success:
-            number = out.stdout.strip()
-            return (True, number) if number else (True, None)
+        pr = gh_client.lookup_open_pr(cwd)
+        if pr and pr.get("number") is not None:
+            return (True, str(pr["number"]))
         return (True, None)
 
     @hookimpl
     def vcs_mail(self, revision: str, cwd: str) -> tuple[bool, str | None]:
+        # The push goes through _run so it keeps the non-interactive env
+        # (GIT_TERMINAL_PROMPT=0, askpass disabled, closed stdin) and the
+        # git-lock retry; the PR probe it pairs with is already a single
+        # cached REST call, so no forks are saved by chaining in a shell.
         out = self._run(["git", "push", "-u", "origin", revision], cwd)
-        if not out.success:
+        if out.returncode != 0 or gh_client.lookup_open_pr(cwd) is not None:
             return self._to_result(out, "git push")
-        pr_check = self._run(
-            ["gh", "pr", "view", "--json", "number", "-q", ".number"], cwd
-        )
-        if not pr_check.success:
-            pr_create = self._run(["gh", "pr", "create", "--fill"], cwd)
-            if not pr_create.success:
-                return self._to_result(pr_create, "gh pr create")
-        return (True, None)
+        out = self._run(["gh", "pr", "create", "--fill"], cwd)
+        if out.returncode == 0:
+            # The lookup above memoized None for this (cwd, branch, sha);
+            # the new PR must be visible to the classify calls that follow.
+            gh_client.invalidate_pr_lookup()
+        return self._to_result(out, "gh pr create")
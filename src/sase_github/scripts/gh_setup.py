@@ -1,13 +1,6 @@
 """Setup step for the #gh xprompt workflow."""
 
-import os
-
-from sase.workspace_provider import resolve_ref
-from sase.workspace_utils import ensure_git_clone
-from sase.running_field import (
-    claim_workspace,
-    get_first_available_axe_workspace,
-)
+from sase_github.gh_workspace import allocate_gh_workspace
 
 
 def main(
@@ -21,46 +14,25 @@ def main(
 
     Prints key=value output for the workflow executor.
     """
-    resolved = resolve_ref(gh_ref, "gh")
-
-    project_name = resolved.project_name
-    project_file = resolved.project_file
-
-    # Check if workspace was pre-allocated by the TUI
-    pre_allocated = os.environ.get("SASE_GH_PRE_ALLOCATED") == "1"
-    if pre_allocated:
-        workspace_num = int(os.environ["SASE_GH_WORKSPACE_NUM"])
-        workspace_dir = os.environ["SASE_GH_WORKSPACE_DIR"]
-    elif n is not None:
-        workspace_num = n
-        workspace_dir = ensure_git_clone(resolved.primary_workspace_dir, workspace_num)
-    else:
-        workspace_num = get_first_available_axe_workspace(project_file)
-        workspace_dir = ensure_git_clone(resolved.primary_workspace_dir, workspace_num)
-
-    pid = os.getpid()
-    workflow_name = workflow_label or f"gh-{gh_ref}"
-
-    # Skip claiming when pre-allocated — the launcher already claimed the workspace
-    if not pre_allocated:
-        claim_workspace(
-            project_file,
-            workspace_num,
-            workflow_name,
-            pid,
-            None,
-            pinned=not release,
+    allocated = allocate_gh_workspace(
+        gh_ref, n=n, release=release, workflow_label=workflow_label
+    )
+    resolved = allocated.resolved
+
+    # One write keeps the output atomic for piped consumers.
+    print(
+        "\n".join(
+            [
+                f"project_name={resolved.project_name}",
+                f"project_file={resolved.project_file}",
+                f"workspace_dir={allocated.workspace_dir}",
+                f"workspace_num={allocated.workspace_num}",
+                f"checkout_target={resolved.checkout_target}",
+                f"primary_workspace_dir={resolved.primary_workspace_dir}",
+                f"should_release={'true' if allocated.should_release else 'false'}",
+                f"_chdir={allocated.workspace_dir}",
+                f"meta_workspace={allocated.workspace_num}",
+                f"workflow_name={allocated.workflow_name}",
+            ]
         )
-
-    print(f"project_name={project_name}")
-    print(f"project_file={project_file}")
-    print(f"workspace_dir={workspace_dir}")
-    print(f"workspace_num={workspace_num}")
-    print(f"checkout_target={resolved.checkout_target}")
-    print(f"primary_workspace_dir={resolved.primary_workspace_dir}")
-    # Don't release pre-allocated workspaces — the launcher handles that
-    should_release = release and not pre_allocated
-    print(f"should_release={'true' if should_release else 'false'}")
-    print(f"_chdir={workspace_dir}")
-    print(f"meta_workspace={workspace_num}")
-    print(f"workflow_name={workflow_name}")
+    )
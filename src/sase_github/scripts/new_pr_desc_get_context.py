@@ -1,10 +1,85 @@
 """Get context step for the #new_pr_desc xprompt workflow."""
 
+import os
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-from sase.ace.changespec import find_all_changespecs
-from sase.workspace_utils import get_default_branch, parse_workspace_dir
+from sase.ace.changespec import ChangeSpec, find_all_changespecs
+from sase.workspace_utils import parse_workspace_dir
+
+from sase_github.gh_workspace import default_branch_name
+
+_changespec_by_name: dict[str, ChangeSpec] = {}
+
+
+def _get_changespec(name: str) -> ChangeSpec | None:
+    """Look up a ChangeSpec by name via a lazily built index.
+
+    ``find_all_changespecs`` scans the filesystem; one scan populates the
+    index and repeat lookups within the process are dict hits.
+    """
+    if not _changespec_by_name:
+        _changespec_by_name.update({cs.name: cs for cs in find_all_changespecs()})
+    return _changespec_by_name.get(name)
+
+
+_DIFF_CAP_BYTES = 5000
+
+
+def _run_git_stdout(cmd: list[str], cwd: str) -> str:
+    """Run a git command and return its stdout, or ``""`` on any failure."""
+    try:
+        result = subprocess.run(
+            cmd,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return result.stdout if result.returncode == 0 else ""
+    except Exception:
+        return ""
+
+
+def _run_git_stdout_capped(cmd: list[str], cwd: str, limit: int) -> str:
+    """Run a git command and return at most *limit* bytes of its stdout.
+
+    Reads the cap straight off the pipe and then stops the process, so a
+    multi-megabyte diff is never fully buffered or decoded just to be
+    truncated afterwards.
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert proc.stdout is not None  # for mypy
+        data = proc.stdout.read(limit)
+        proc.stdout.close()
+        proc.terminate()
+        proc.wait()
+        return data.decode("utf-8", errors="replace")
+    except Exception:
+        return ""
+
+
+def _emit_error(error: str, *, branch_name: str) -> None:
+    """Emit the error-path key=value block in a single write."""
+    print(
+        "\n".join(
+            [
+                f"error={error}",
+                "description=",
+                "diff=",
+                "workspace_dir=",
+                "default_branch=",
+                f"branch_name={branch_name}",
+            ]
+        )
+    )
 
 
 def main(*, name: str) -> None:
@@ -12,77 +87,64 @@ def main(*, name: str) -> None:
 
     Prints key=value output for the workflow executor.
     """
-    # Find the ChangeSpec
-    changespec = None
-    for cs in find_all_changespecs():
-        if cs.name == name:
-            changespec = cs
-            break
+    # Fresh index per invocation; within one run lookups stay dict hits.
+    _changespec_by_name.clear()
 
+    # Find the ChangeSpec
+    changespec = _get_changespec(name)
     if changespec is None:
-        print(f"error=ChangeSpec '{name}' not found")
-        print("description=")
-        print("diff=")
-        print("workspace_dir=")
-        print("default_branch=")
-        print("branch_name=")
+        _emit_error(f"ChangeSpec '{name}' not found", branch_name="")
         return
 
     project_file = changespec.file_path
     workspace_dir = parse_workspace_dir(project_file)
     if not workspace_dir:
-        print("error=WORKSPACE_DIR is not set for this project")
-        print("description=")
-        print("diff=")
-        print("workspace_dir=")
-        print("default_branch=")
-        print(f"branch_name={name}")
+        _emit_error("WORKSPACE_DIR is not set for this project", branch_name=name)
         return
 
-    default_branch_ref = get_default_branch(workspace_dir)
-    default_branch = default_branch_ref.rsplit("/", 1)[-1]
+    default_branch = default_branch_name(workspace_dir)
 
     # Get description
     desc = changespec.description or "No description"
 
-    # Get diff against default branch
-    try:
-        result = subprocess.run(
+    # Get diff against default branch and commit subjects. The two git
+    # calls are independent, so run them concurrently to overlap their
+    # fork+exec+repo-open latencies.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        diff_future = executor.submit(
+            _run_git_stdout_capped,
             ["git", "diff", f"origin/{default_branch}...{name}"],
-            cwd=workspace_dir,
-            capture_output=True,
-            text=True,
-            check=False,
+            workspace_dir,
+            _DIFF_CAP_BYTES,
         )
-        diff = result.stdout[:5000] if result.returncode == 0 else ""
-    except Exception:
-        diff = ""
-
-    # Get commit subjects
-    try:
-        result = subprocess.run(
+        log_future = executor.submit(
+            _run_git_stdout,
             ["git", "log", "--format=%s", f"origin/{default_branch}..{name}"],
-            cwd=workspace_dir,
-            capture_output=True,
-            text=True,
-            check=False,
+            workspace_dir,
         )
-        commits = result.stdout.strip() if result.returncode == 0 else ""
-    except Exception:
-        commits = ""
+        diff = diff_future.result()
+        commits = log_future.result().strip()
 
-    # Save diff to temp file for the prompt
-    diff_file = tempfile.NamedTemporaryFile(
-        mode="w", suffix=".diff", prefix="pr_desc_", delete=False
+    # Save diff to temp file for the prompt. One raw write on the mkstemp
+    # fd — no TextIOWrapper buffering. The file is written even when the
+    # diff is empty: new_pr_desc.yml attaches ``@{{ get_context.diff_file }}``
+    # and expects a real path.
+    fd, diff_path = tempfile.mkstemp(suffix=".diff", prefix="pr_desc_")
+    os.write(fd, diff.encode())
+    os.close(fd)
+
+    # One write keeps the output atomic for piped consumers.
+    print(
+        "\n".join(
+            [
+                "error=",
+                f"description={desc}",
+                f"diff_file={diff_path}",
+                f"commits={commits}",
+                f"workspace_dir={workspace_dir}",
+                f"default_branch={default_branch}",
+                f"branch_name={name}",
+                f"_chdir={workspace_dir}",
+            ]
+        )
     )
-    diff_file.write(diff)
-    diff_file.close()
-
-    print("error=")
-    print(f"description={desc}")
-    print(f"diff_file={diff_file.name}")
-    print(f"commits={commits}")
-    print(f"workspace_dir={workspace_dir}")
-    print(f"default_branch={default_branch}")
-    print(f"branch_name={name}")
-    print(f"_chdir={workspace_dir}")
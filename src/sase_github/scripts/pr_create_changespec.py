@@ -2,19 +2,25 @@
 
 import os
 
-from sase.workspace_utils import get_default_branch
 from sase.vcs_provider import get_vcs_provider
 from sase.workflow_utils import get_project_file_path
 from sase.workspace_changespec import create_changespec_for_workflow
 
+from sase_github.gh_workspace import default_branch_name
+
+# Single-char substitution via translate skips str.replace's
+# general-purpose search machinery.
+_DASH_TO_UNDER = str.maketrans("-", "_")
+
 
 def main(*, name: str, prompt: str, response: str) -> None:
     """Derive project info from cwd and create a changespec.
 
     Prints key=value output for the workflow executor.
     """
-    provider = get_vcs_provider(os.getcwd())
-    ok, project_name = provider.get_workspace_name(os.getcwd())
+    cwd = os.getcwd()
+    provider = get_vcs_provider(cwd)
+    ok, project_name = provider.get_workspace_name(cwd)
     if not ok or not project_name:
         print("success=false")
         print("error=Could not determine project name from workspace")
@@ -26,11 +32,10 @@ def main(*, name: str, prompt: str, response: str) -> None:
     project_file = get_project_file_path(project_name)
 
     # Determine default branch
-    default_branch_ref = get_default_branch(os.getcwd())
-    default_branch = default_branch_ref.rsplit("/", 1)[-1]
+    default_branch = default_branch_name(cwd)
 
     # Build CL name: {project}_{name_with_underscores}
-    cl_name = f"{project_name}_{name.replace('-', '_')}"
+    cl_name = f"{project_name}_{name.translate(_DASH_TO_UNDER)}"
 
     result = create_changespec_for_workflow(
         project_name=project_name,
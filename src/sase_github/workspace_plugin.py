@@ -5,10 +5,13 @@ handling workflow detection, reference resolution, change labels, and
 PR-based submission.
 """
 
+import functools
 import os
 import re
 import subprocess
+from collections import deque
 from pathlib import Path
+from typing import Any
 
 from sase.workspace_provider import ResolvedRef, WorkflowMetadata, hookimpl
 from sase.workspace_utils import (
@@ -18,6 +21,169 @@ from sase.workspace_utils import (
 )
 
 
+# Compiled once at import; hook consumers that need the raw string get
+# it via .pattern while in-process matching can use the compiled object
+# directly instead of re-compiling per reference parse.
+GH_REF_REGEX = re.compile(r"(?:^|(?<=\s))#gh(?::([a-zA-Z0-9_./-]+)|\(([^)]+)\))")
+
+# Fixed argv built once; also keeps the exact merge invocation greppable.
+_GH_PR_MERGE_CMD = ("gh", "pr", "merge", "--merge", "--delete-branch")
+
+
+def _workspace_dir_cached(project_file: str) -> str | None:
+    """``parse_workspace_dir`` cached per project file and mtime.
+
+    Detection, submission, and reference resolution all re-parse the
+    same project files within one operation; keying on mtime keeps the
+    cache correct when a file is edited mid-process.
+    """
+    try:
+        mtime = os.path.getmtime(project_file)
+    except OSError:
+        return parse_workspace_dir(project_file)
+    return _parse_workspace_dir_at(project_file, mtime)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_workspace_dir_at(project_file: str, mtime: float) -> str | None:
+    return parse_workspace_dir(project_file)
+
+
+@functools.lru_cache(maxsize=1)
+def _changespecs_by_name() -> dict[str, Any]:
+    """Name-indexed ChangeSpecs from one filesystem scan, cached.
+
+    ``find_all_changespecs`` walks every project directory; building the
+    index costs one scan and turns each subsequent by-name lookup into a
+    dict hit instead of a linear search over re-scanned specs.
+
+    The cache is scoped to a single top-level operation: ``ws_submit``
+    and ``resolve_gh_ref`` each clear it on entry so specs created or
+    finalized since the last scan are seen, while repeat lookups within
+    one operation still share the scan.
+    """
+    from sase.ace.changespec import find_all_changespecs
+
+    return {cs.name: cs for cs in find_all_changespecs()}
+
+
+@functools.lru_cache(maxsize=1024)
+def _norm(path: str) -> str:
+    """``os.path.normpath`` memoized on the raw string.
+
+    The same workspace-dir strings are normalized on every repo-path
+    resolve; the normalized form is constant per input.
+    """
+    return os.path.normpath(path)
+
+
+@functools.lru_cache(maxsize=64)
+def _default_branch_cached(workspace_dir: str) -> str:
+    """Cached ``get_default_branch``: one fork per workspace directory.
+
+    The default branch is stable for the life of the process, and both
+    reference resolution and submission ask for it repeatedly.
+    """
+    return get_default_branch(workspace_dir)
+
+
+@functools.lru_cache(maxsize=1024)
+def _git_repo_info(path: str) -> tuple[str, str] | None:
+    """Resolve ``(git_dir, toplevel)`` for *path* in one fork, cached.
+
+    ``rev-parse`` answers both questions at once and handles worktrees,
+    submodules, and nested checkouts that a plain ``.git`` isdir check
+    would misjudge. Returns ``None`` when *path* is not inside a git
+    work tree.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", path, "rev-parse", "--git-dir", "--show-toplevel"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.splitlines()
+    if len(lines) < 2:
+        return None
+    return (lines[0], lines[1])
+
+
+@functools.lru_cache(maxsize=256)
+def _load_git_config(workspace_dir: str) -> dict[str, str] | None:
+    """Load the repo-local git config of *workspace_dir* as a dict, cached.
+
+    One ``git config --local -z -l`` fork serves every subsequent
+    per-key read for the directory in-process, instead of a fork per
+    ``--get``. Callers pass the repo toplevel so every path into the
+    same repo shares one cache entry. Returns ``None`` when
+    *workspace_dir* is not inside a git repository (``--local`` makes
+    git fail fast there).
+    """
+    try:
+        # Only stdout matters: skip the stderr pipe, and name the
+        # encoding explicitly to avoid the locale lookup.
+        result = subprocess.run(
+            ["git", "-C", workspace_dir, "config", "--local", "-z", "-l"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    config: dict[str, str] = {}
+    for entry in result.stdout.split("\0"):
+        if not entry:
+            continue
+        key, _, value = entry.partition("\n")
+        config[key] = value
+    return config
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_workflow_type(project_file: str) -> str | None:
+    """Return ``'gh'`` if the project is GitHub-hosted, else ``None``.
+
+    Cached per project file — detection shells out to git, and hooks
+    like ``ws_get_change_label`` re-run it for the same file many times
+    within a process.
+    """
+    workspace_dir = _workspace_dir_cached(project_file)
+    if not workspace_dir:
+        return None
+
+    from sase.workspace_utils import parse_bare_repo_dir
+
+    # Cheapest check first: a pure-Python project-file parse, then the
+    # git forks, which fail fast for non-repos.
+    if parse_bare_repo_dir(project_file):
+        return None  # bare-git plugin handles this
+
+    info = _git_repo_info(workspace_dir)
+    if info is None:
+        return None  # not a git repository
+
+    config = _load_git_config(info[1])
+    if config is None:
+        return None
+
+    url = config.get("remote.origin.url", "")
+    if url and not url.startswith(("http://", "https://", "git@", "ssh://")):
+        return None  # local path → bare-git
+
+    return "gh"
+
+
 class GitHubWorkspacePlugin:
     """Workspace provider plugin for GitHub-hosted projects."""
 
@@ -27,7 +193,7 @@ class GitHubWorkspacePlugin:
     def ws_get_workflow_metadata(self) -> WorkflowMetadata | None:
         return WorkflowMetadata(
             workflow_type="gh",
-            ref_pattern=r"(?:^|(?<=\s))#gh(?::([a-zA-Z0-9_./-]+)|\(([^)]+)\))",
+            ref_pattern=GH_REF_REGEX.pattern,
             display_name="GitHub",
             pre_allocated_env_prefix="SASE_GH",
             vcs_family="git",
@@ -37,40 +203,14 @@ class GitHubWorkspacePlugin:
     @hookimpl
     def ws_detect_workflow_type(self, project_file: str) -> str | None:
         """Return ``'gh'`` if the project is GitHub-hosted, else ``None``."""
-        workspace_dir = parse_workspace_dir(project_file)
-        if not workspace_dir or not os.path.isdir(
-            os.path.join(workspace_dir, ".git")
-        ):
-            return None
-
-        from sase.workspace_utils import parse_bare_repo_dir
-
-        if parse_bare_repo_dir(project_file):
-            return None  # bare-git plugin handles this
-
-        try:
-            result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                cwd=workspace_dir,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.returncode == 0:
-                url = result.stdout.strip()
-                if url and not url.startswith(
-                    ("http://", "https://", "git@", "ssh://")
-                ):
-                    return None  # local path → bare-git
-        except Exception:
-            pass
-
-        return "gh"
+        return _detect_workflow_type(project_file)
 
     @hookimpl
     def ws_get_change_label(self, project_file: str) -> str | None:
         """Return ``'PR'`` for GitHub projects."""
-        if self.ws_detect_workflow_type(project_file=project_file) == "gh":
+        # Same memoized table the detection hook uses, so the common
+        # detect-then-label hook sequence runs detection once.
+        if _detect_workflow_type(project_file) == "gh":
             return "PR"
         return None
 
@@ -180,10 +320,9 @@ class GitHubWorkspacePlugin:
         if vcs_type != "gh":
             return None
 
-        from rich.console import Console as RichConsole
         from rich.markup import escape as escape_markup
 
-        from sase.ace.changespec import ChangeSpec, find_all_changespecs
+        from sase.ace.changespec import ChangeSpec
         from sase.ace.hooks.processes import (
             kill_and_persist_all_running_processes,
         )
@@ -196,25 +335,23 @@ class GitHubWorkspacePlugin:
         )
         from sase.vcs_provider import get_vcs_provider
 
-        rich_console: RichConsole | None = (
-            console if isinstance(console, RichConsole) else None
-        )
-
-        # Find the ChangeSpec object
-        changespec: ChangeSpec | None = None
-        for cs in find_all_changespecs():
-            if cs.name == changespec_name:
-                changespec = cs
-                break
+        # Duck-typed: anything print-capable works, and the no-console
+        # path never pays the rich import at all. Bind the log callable
+        # once instead of guarding every status line.
+        rich_console: Any = console if hasattr(console, "print") else None
+        log: Any = rich_console.print if rich_console else _no_log
+
+        # One fresh scan serves both the target lookup and the children
+        # check; cleared per submit so finalized statuses aren't stale.
+        _changespecs_by_name.cache_clear()
+        by_name = _changespecs_by_name()
+        changespec: ChangeSpec | None = by_name.get(changespec_name)
         if changespec is None:
             return (False, f"ChangeSpec '{changespec_name}' not found")
+        all_changespecs = list(by_name.values())
 
         log_fn = (
-            (
-                lambda msg: rich_console.print(
-                    f"[cyan]{escape_markup(msg)}[/cyan]"
-                )
-            )
+            (lambda msg: log(f"[cyan]{escape_markup(msg)}[/cyan]"))
             if rich_console
             else None
         )
@@ -226,7 +363,6 @@ class GitHubWorkspacePlugin:
             log_fn=log_fn,
         )
 
-        all_changespecs = find_all_changespecs()
         if has_active_children(
             changespec,
             all_changespecs,
@@ -238,7 +374,7 @@ class GitHubWorkspacePlugin:
                 "parent and are not Submitted, Reverted, or Archived",
             )
 
-        workspace_dir = parse_workspace_dir(changespec_file)
+        workspace_dir = _workspace_dir_cached(changespec_file)
         if not workspace_dir:
             return (False, "WORKSPACE_DIR is not set for this project")
 
@@ -253,10 +389,7 @@ class GitHubWorkspacePlugin:
         except RuntimeError as e:
             return (False, f"Failed to get workspace directory: {e}")
 
-        if rich_console:
-            rich_console.print(
-                f"[cyan]Claiming workspace #{workspace_num}[/cyan]"
-            )
+        log(f"[cyan]Claiming workspace #{workspace_num}[/cyan]")
 
         if not claim_workspace(
             changespec_file,
@@ -271,10 +404,7 @@ class GitHubWorkspacePlugin:
             )
 
         try:
-            if rich_console:
-                rich_console.print(
-                    f"[cyan]Checking out {escape_markup(changespec_name)}...[/cyan]"
-                )
+            log(f"[cyan]Checking out {escape_markup(changespec_name)}...[/cyan]")
 
             provider = get_vcs_provider(ws_dir)
             branch_name = provider.resolve_revision(
@@ -284,20 +414,17 @@ class GitHubWorkspacePlugin:
             if not success:
                 return (False, f"Failed to checkout branch: {error}")
 
-            default_branch_ref = get_default_branch(ws_dir)
+            default_branch_ref = _default_branch_cached(ws_dir)
             default_branch = default_branch_ref.rsplit("/", 1)[-1]
 
-            if rich_console:
-                rich_console.print(
-                    f"[cyan]Merging {escape_markup(changespec_name)} into "
-                    f"{escape_markup(default_branch)}...[/cyan]"
-                )
+            log(
+                f"[cyan]Merging {escape_markup(changespec_name)} into "
+                f"{escape_markup(default_branch)}...[/cyan]"
+            )
 
             has_pr = _check_existing_pr(ws_dir)
             if has_pr:
-                return _submit_via_pr_merge(
-                    changespec, ws_dir, rich_console
-                )
+                return _submit_via_pr_merge(changespec, ws_dir, rich_console, log)
             return (
                 False,
                 "GitHub project has no PR for this branch. "
@@ -310,17 +437,19 @@ class GitHubWorkspacePlugin:
                 workflow_name,
                 changespec_name,
             )
-            if rich_console:
-                rich_console.print(
-                    f"[cyan]Released workspace #{workspace_num}[/cyan]"
-                )
+            log(f"[cyan]Released workspace #{workspace_num}[/cyan]")
 
 
 # ── Private helpers ─────────────────────────────────────────────────
 
 
 def _clone_gh_repo(user: str, project: str, target_dir: str) -> None:
-    """Clone a GitHub repo to the target directory."""
+    """Clone a GitHub repo to the target directory.
+
+    Streams stderr line-by-line instead of buffering it whole, so a
+    clone of a large repo keeps memory bounded; only a short tail is
+    retained for the error message.
+    """
     from sase_github.config import get_github_username
 
     gh_user = get_github_username()
@@ -331,21 +460,31 @@ def _clone_gh_repo(user: str, project: str, target_dir: str) -> None:
     parent = os.path.dirname(target_dir.rstrip("/"))
     os.makedirs(parent, exist_ok=True)
 
-    try:
-        subprocess.run(
-            ["git", "clone", url, target_dir.rstrip("/")],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-    except subprocess.CalledProcessError as e:
+    proc = subprocess.Popen(
+        ["git", "clone", url, target_dir.rstrip("/")],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=1,
+        encoding="utf-8",
+        errors="replace",
+    )
+    stderr_tail: deque[str] = deque(maxlen=20)
+    assert proc.stderr is not None
+    for line in proc.stderr:
+        stderr_tail.append(line)
+    proc.stderr.close()
+
+    if proc.wait() != 0:
         error_msg = f"git clone failed for {url}"
-        if e.stderr:
-            error_msg += f": {e.stderr.strip()}"
-        raise RuntimeError(error_msg) from e
+        tail = "".join(stderr_tail).strip()
+        if tail:
+            error_msg += f": {tail}"
+        raise RuntimeError(error_msg)
 
 
-def resolve_gh_ref(gh_ref: str) -> ResolvedRef:
+def resolve_gh_ref(
+    gh_ref: str, *, sase_root: Path | None = None
+) -> ResolvedRef:
     """Resolve a ``#gh`` reference to workspace and branch information.
 
     Three dispatch modes:
@@ -353,16 +492,23 @@ def resolve_gh_ref(gh_ref: str) -> ResolvedRef:
     1. **Repo path** (contains ``/``): ``user/project`` → derive workspace
        from ``~/projects/github/<user>/<project>/``.
     2. **Project shorthand** (no ``/``, matching project dir): look up
-       WORKSPACE_DIR from ``~/.sase/projects/<name>/<name>.gp``.
+       WORKSPACE_DIR from ``<sase_root>/projects/<name>/<name>.gp``,
+       where *sase_root* defaults to ``~/.sase``.
     3. **ChangeSpec name**: search all changespecs for a matching name,
        read WORKSPACE_DIR from its project file.
 
     Raises:
         ValueError: If the reference cannot be resolved.
     """
-    from sase.ace.changespec import find_all_changespecs
+    # Fresh scan per resolution: a changespec created since the last
+    # call must be resolvable by Mode 3.
+    _changespecs_by_name.cache_clear()
 
-    projects_base = Path.home() / ".sase" / "projects"
+    # One $HOME lookup per resolution; every derived path hangs off it.
+    home = Path.home()
+    if sase_root is None:
+        sase_root = home / ".sase"
+    projects_base = sase_root / "projects"
 
     # --- Mode 1: repo path (user/project) ---
     if "/" in gh_ref:
@@ -373,24 +519,29 @@ def resolve_gh_ref(gh_ref: str) -> ResolvedRef:
             )
         user, project = parts
         primary_workspace_dir = (
-            str(Path.home() / "projects" / "github" / user / project) + "/"
+            str(home / "projects" / "github" / user / project) + "/"
         )
         project_file = str(projects_base / project / f"{project}.gp")
 
-        existing = parse_workspace_dir(project_file)
-        if existing and os.path.normpath(existing) != os.path.normpath(
+        existing = _workspace_dir_cached(project_file)
+        already_registered = existing is not None and _norm(existing) == _norm(
             primary_workspace_dir
-        ):
+        )
+        if existing and not already_registered:
             raise ValueError(
                 f"WORKSPACE_DIR conflict for '{project}': "
                 f"existing={existing}, derived={primary_workspace_dir}"
             )
 
-        if not os.path.isdir(primary_workspace_dir.rstrip("/")):
+        workspace_exists = os.path.isdir(primary_workspace_dir.rstrip("/"))
+        if not workspace_exists:
             _clone_gh_repo(user, project, primary_workspace_dir)
 
-        set_workspace_dir(project_file, primary_workspace_dir)
-        checkout_target = get_default_branch(primary_workspace_dir)
+        # Steady state — workspace on disk and already registered —
+        # needs no project-file rewrite.
+        if not (already_registered and workspace_exists):
+            set_workspace_dir(project_file, primary_workspace_dir)
+        checkout_target = _default_branch_cached(primary_workspace_dir)
 
         return ResolvedRef(
             project_file=project_file,
@@ -403,9 +554,9 @@ def resolve_gh_ref(gh_ref: str) -> ResolvedRef:
     project_dir = projects_base / gh_ref
     project_file_path = project_dir / f"{gh_ref}.gp"
     if project_dir.is_dir() and project_file_path.exists():
-        workspace_dir = parse_workspace_dir(str(project_file_path))
+        workspace_dir = _workspace_dir_cached(str(project_file_path))
         if workspace_dir:
-            checkout_target = get_default_branch(workspace_dir)
+            checkout_target = _default_branch_cached(workspace_dir)
             return ResolvedRef(
                 project_file=str(project_file_path),
                 project_name=gh_ref,
@@ -414,45 +565,55 @@ def resolve_gh_ref(gh_ref: str) -> ResolvedRef:
             )
 
     # --- Mode 3: ChangeSpec name ---
-    for cs in find_all_changespecs():
-        if cs.name == gh_ref:
-            workspace_dir = parse_workspace_dir(cs.file_path)
-            if not workspace_dir:
-                raise ValueError(
-                    f"ChangeSpec '{gh_ref}' found in {cs.file_path} "
-                    "but WORKSPACE_DIR is not set"
-                )
-            return ResolvedRef(
-                project_file=cs.file_path,
-                project_name=cs.project_basename,
-                primary_workspace_dir=workspace_dir,
-                checkout_target=f"origin/{gh_ref}",
+    cs = _changespecs_by_name().get(gh_ref)
+    if cs is not None:
+        workspace_dir = _workspace_dir_cached(cs.file_path)
+        if not workspace_dir:
+            raise ValueError(
+                f"ChangeSpec '{gh_ref}' found in {cs.file_path} "
+                "but WORKSPACE_DIR is not set"
             )
+        return ResolvedRef(
+            project_file=cs.file_path,
+            project_name=cs.project_basename,
+            primary_workspace_dir=workspace_dir,
+            checkout_target=f"origin/{gh_ref}",
+        )
 
     raise ValueError(f"Cannot resolve gh_ref '{gh_ref}'")
 
 
 def _check_existing_pr(cwd: str) -> bool:
-    """Check if a PR exists for the current branch."""
-    try:
-        result = subprocess.run(
-            ["gh", "pr", "view", "--json", "number"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+    """Check if a PR exists for the current branch.
+
+    Uses the pooled REST lookup, whose result is cached per
+    ``(cwd, branch, HEAD sha)`` and shared with the VCS plugin's
+    change-URL and CL-number hooks — no extra gh fork or API call when
+    those run in the same pass.
+    """
+    from sase_github import gh_client
+
+    return gh_client.lookup_open_pr(cwd) is not None
+
+
+def _no_log(*args: object, **kwargs: object) -> None:
+    """No-op stand-in for ``Console.print`` when no console is given."""
 
 
 def _submit_via_pr_merge(
     changespec: object,
     ws_dir: str,
     console: object | None,
+    log: Any = _no_log,
 ) -> tuple[bool, str | None]:
-    """Submit by merging the PR via ``gh pr merge``."""
+    """Submit by merging the PR via ``gh pr merge``.
+
+    *log* is the pre-bound console print callable from ``ws_submit``
+    (or a no-op); *console* is still threaded through for
+    ``finalize_submission``.
+    """
+    from rich.markup import escape as escape_markup
+
     from sase_github.config import get_github_username
 
     username = get_github_username()
@@ -464,36 +625,41 @@ def _submit_via_pr_merge(
             "~/.config/sase/sase.yml",
         )
 
-    if console:
-        from rich.console import Console as RichConsole
-
-        if isinstance(console, RichConsole):
-            console.print("[cyan]Merging PR via gh pr merge...[/cyan]")
+    log("[cyan]Merging PR via gh pr merge...[/cyan]")
 
+    # gh pr merge can take seconds; stream its output line-by-line so
+    # progress shows as it happens, keeping only a bounded tail for the
+    # error message.
     try:
-        result = subprocess.run(
-            ["gh", "pr", "merge", "--merge", "--delete-branch"],
+        proc = subprocess.Popen(
+            _GH_PR_MERGE_CMD,
             cwd=ws_dir,
-            capture_output=True,
-            text=True,
-            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            encoding="utf-8",
+            errors="replace",
         )
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() or result.stdout.strip()
-            return (
-                False,
-                f"gh pr merge failed: {error_msg}"
-                if error_msg
-                else "gh pr merge failed",
-            )
     except FileNotFoundError:
         return (False, "gh command not found")
 
-    if console:
-        from rich.console import Console as RichConsole
+    output_tail: deque[str] = deque(maxlen=20)
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        output_tail.append(line)
+        log(escape_markup(line.rstrip()))
+    proc.stdout.close()
+
+    if proc.wait() != 0:
+        error_msg = "".join(output_tail).strip()
+        return (
+            False,
+            f"gh pr merge failed: {error_msg}"
+            if error_msg
+            else "gh pr merge failed",
+        )
 
-        if isinstance(console, RichConsole):
-            console.print("[green]PR merged successfully[/green]")
+    log("[green]PR merged successfully[/green]")
 
     from sase.submission_utils import finalize_submission
 
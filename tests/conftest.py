@@ -0,0 +1,18 @@
+"""Shared fixtures for the sase-github test suite."""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def cl_gp_file(tmp_path_factory: pytest.TempPathFactory) -> tuple[str, str]:
+    """A standard project file plus git workspace, built once per run.
+
+    Returns ``(project_file, workspace_dir)`` as strings. Tests that
+    need different project-file contents still write their own.
+    """
+    d = tmp_path_factory.mktemp("gp")
+    workspace = d / "repo"
+    (workspace / ".git").mkdir(parents=True)
+    gp = d / "proj.gp"
+    gp.write_text(f"WORKSPACE_DIR: {workspace}\nNAME: cl\n")
+    return (str(gp), str(workspace))
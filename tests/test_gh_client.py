@@ -0,0 +1,166 @@
+"""Tests for sase_github.gh_client module (pooled GitHub REST client).
+
+Nothing here is compute-heavy — time is spent in patch plumbing and the
+tmp_path git-layout writes — so prefer shared fixtures over clever code.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sase_github import gh_client
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+    """Reset module-level caches so tests don't leak state."""
+    gh_client._get_token.cache_clear()
+    gh_client.get_client.cache_clear()
+    gh_client.get_repo_info.cache_clear()
+    gh_client._lookup_open_pr_cached.cache_clear()
+
+
+# === Tests for get_repo_info ===
+
+
+@patch("sase_github.gh_client.subprocess.run")
+def test_get_repo_info_https_url(mock_run: MagicMock) -> None:
+    # The consumer only reads returncode/stdout, so a plain
+    # namespace stands in for CompletedProcess.
+    mock_run.return_value = SimpleNamespace(
+        returncode=0, stdout="https://github.com/alice/myrepo.git\n"
+    )
+    assert gh_client.get_repo_info("/workspace") == ("alice", "myrepo")
+
+
+@patch("sase_github.gh_client.subprocess.run")
+def test_get_repo_info_ssh_url(mock_run: MagicMock) -> None:
+    mock_run.return_value = SimpleNamespace(
+        returncode=0, stdout="git@github.com:alice/myrepo.git\n"
+    )
+    assert gh_client.get_repo_info("/workspace") == ("alice", "myrepo")
+
+
+@patch("sase_github.gh_client.subprocess.run")
+def test_get_repo_info_non_github_url(mock_run: MagicMock) -> None:
+    mock_run.return_value = SimpleNamespace(
+        returncode=0, stdout="https://gitlab.com/alice/myrepo.git\n"
+    )
+    assert gh_client.get_repo_info("/workspace") is None
+
+
+@patch("sase_github.gh_client.subprocess.run")
+def test_get_repo_info_cached_per_cwd(mock_run: MagicMock) -> None:
+    """Repeat lookups for the same directory hit the cache, not git."""
+    mock_run.return_value = SimpleNamespace(
+        returncode=0, stdout="https://github.com/alice/myrepo\n"
+    )
+    gh_client.get_repo_info("/workspace")
+    gh_client.get_repo_info("/workspace")
+    assert mock_run.call_count == 1
+
+
+# === Tests for _read_git_head ===
+
+
+def test_read_git_head_loose_ref(tmp_path: Path) -> None:
+    repo = tmp_path
+    heads = repo / ".git" / "refs" / "heads"
+    heads.mkdir(parents=True)
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/feature\n")
+    (heads / "feature").write_text("a" * 40 + "\n")
+
+    assert gh_client._read_git_head(str(repo)) == ("feature", "a" * 40)
+
+
+def test_read_git_head_packed_ref(tmp_path: Path) -> None:
+    repo = tmp_path
+    (repo / ".git").mkdir()
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/feature\n")
+    (repo / ".git" / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted \n"
+        f"{'b' * 40} refs/heads/feature\n"
+    )
+
+    assert gh_client._read_git_head(str(repo)) == ("feature", "b" * 40)
+
+
+def test_read_git_head_detached(tmp_path: Path) -> None:
+    repo = tmp_path
+    (repo / ".git").mkdir()
+    (repo / ".git" / "HEAD").write_text("c" * 40 + "\n")
+
+    assert gh_client._read_git_head(str(repo)) == (None, "c" * 40)
+
+
+def test_read_git_head_missing_repo(tmp_path: Path) -> None:
+    assert gh_client._read_git_head(str(tmp_path)) == (None, None)
+
+
+# === Tests for lookup_open_pr ===
+
+
+@patch("sase_github.gh_client.get_client")
+@patch("sase_github.gh_client.get_current_branch", return_value="feature")
+@patch("sase_github.gh_client.get_repo_info", return_value=("alice", "myrepo"))
+def test_lookup_open_pr_found(
+    mock_repo: MagicMock, mock_branch: MagicMock, mock_client: MagicMock
+) -> None:
+    response = MagicMock()
+    response.json.return_value = [
+        {"number": 42, "html_url": "https://github.com/alice/myrepo/pull/42"}
+    ]
+    mock_client.return_value.get.return_value = response
+
+    pr = gh_client.lookup_open_pr("/workspace")
+    assert pr is not None
+    assert pr["number"] == 42
+    mock_client.return_value.get.assert_called_once_with(
+        "/repos/alice/myrepo/pulls",
+        params={"head": "alice:feature", "state": "open"},
+    )
+
+
+@patch("sase_github.gh_client.get_client")
+@patch("sase_github.gh_client.get_current_branch", return_value="feature")
+@patch("sase_github.gh_client.get_repo_info", return_value=("alice", "myrepo"))
+def test_lookup_open_pr_none_open(
+    mock_repo: MagicMock, mock_branch: MagicMock, mock_client: MagicMock
+) -> None:
+    response = MagicMock()
+    response.json.return_value = []
+    mock_client.return_value.get.return_value = response
+
+    assert gh_client.lookup_open_pr("/workspace") is None
+
+
+@patch("sase_github.gh_client.get_repo_info", return_value=None)
+def test_lookup_open_pr_no_repo_info(mock_repo: MagicMock) -> None:
+    assert gh_client.lookup_open_pr("/workspace") is None
+
+
+@patch("sase_github.gh_client._get_head_sha", return_value="abc123")
+@patch("sase_github.gh_client.get_client")
+@patch("sase_github.gh_client.get_current_branch", return_value="feature")
+@patch("sase_github.gh_client.get_repo_info", return_value=("alice", "myrepo"))
+def test_lookup_open_pr_memoized_per_head_sha(
+    mock_repo: MagicMock,
+    mock_branch: MagicMock,
+    mock_client: MagicMock,
+    mock_sha: MagicMock,
+) -> None:
+    """Repeat lookups at the same HEAD reuse one API round-trip."""
+    response = MagicMock()
+    response.json.return_value = [{"number": 42}]
+    mock_client.return_value.get.return_value = response
+
+    gh_client.lookup_open_pr("/workspace")
+    gh_client.lookup_open_pr("/workspace")
+    assert mock_client.return_value.get.call_count == 1
+
+    # A new commit changes the key and forces a fresh lookup.
+    mock_sha.return_value = "def456"
+    gh_client.lookup_open_pr("/workspace")
+    assert mock_client.return_value.get.call_count == 2
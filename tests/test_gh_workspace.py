@@ -0,0 +1,107 @@
+"""Tests for sase_github.gh_workspace (workspace allocation helpers).
+
+Env-dependent paths are driven by a single ``patch.dict`` snapshot of
+``os.environ`` per test rather than per-variable setenv chains.
+"""
+
+import os
+from collections.abc import Iterator
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from sase_github import gh_workspace
+
+_GW_MOD = "sase_github.gh_workspace"
+
+_PRE_ALLOCATED_ENV = {
+    "SASE_GH_PRE_ALLOCATED": "1",
+    "SASE_GH_WORKSPACE_NUM": "42",
+    "SASE_GH_WORKSPACE_DIR": "/tmp/ws42",
+}
+
+_RESOLVED = SimpleNamespace(
+    project_file="/specs/proj.gp",
+    project_name="proj",
+    primary_workspace_dir="/work/proj/",
+    checkout_target="origin/main",
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Iterator[None]:
+    """Reset the per-process ref cache between tests."""
+    gh_workspace._resolve_ref_cached.cache_clear()
+    yield
+    gh_workspace._resolve_ref_cached.cache_clear()
+
+
+@patch.dict(os.environ, _PRE_ALLOCATED_ENV, clear=False)
+@patch(f"{_GW_MOD}.claim_workspace")
+@patch(f"{_GW_MOD}.ensure_git_clone")
+@patch(f"{_GW_MOD}.resolve_ref", return_value=_RESOLVED)
+def test_pre_allocated_env(
+    mock_resolve: MagicMock,
+    mock_clone: MagicMock,
+    mock_claim: MagicMock,
+) -> None:
+    """A TUI-pre-allocated workspace is reused, not claimed or cloned."""
+    allocated = gh_workspace.allocate_gh_workspace(
+        "alice/proj", n=None, release=True
+    )
+
+    assert allocated.workspace_num == 42
+    assert allocated.workspace_dir == "/tmp/ws42"
+    assert allocated.should_release is False
+    mock_clone.assert_not_called()
+    mock_claim.assert_not_called()
+
+
+@patch.dict(os.environ, {}, clear=False)
+@patch(f"{_GW_MOD}.claim_workspace")
+@patch(f"{_GW_MOD}.ensure_git_clone", return_value="/clones/ws7")
+@patch(f"{_GW_MOD}.resolve_ref", return_value=_RESOLVED)
+def test_explicit_n(
+    mock_resolve: MagicMock,
+    mock_clone: MagicMock,
+    mock_claim: MagicMock,
+) -> None:
+    """An explicit workspace number is claimed as pinned when not releasing."""
+    os.environ.pop("SASE_GH_PRE_ALLOCATED", None)
+
+    allocated = gh_workspace.allocate_gh_workspace(
+        "alice/proj", n=7, release=False
+    )
+
+    assert allocated.workspace_num == 7
+    assert allocated.workspace_dir == "/clones/ws7"
+    assert allocated.should_release is False
+    mock_clone.assert_called_once_with("/work/proj/", 7)
+    assert mock_claim.call_count == 1
+    assert mock_claim.call_args.kwargs["pinned"] is True
+
+
+@patch.dict(os.environ, {}, clear=False)
+@patch(f"{_GW_MOD}.claim_workspace")
+@patch(f"{_GW_MOD}.ensure_git_clone", return_value="/clones/ws3")
+@patch(f"{_GW_MOD}.get_first_available_axe_workspace", return_value=3)
+@patch(f"{_GW_MOD}.resolve_ref", return_value=_RESOLVED)
+def test_auto_allocate(
+    mock_resolve: MagicMock,
+    mock_avail: MagicMock,
+    mock_clone: MagicMock,
+    mock_claim: MagicMock,
+) -> None:
+    """Without n, the first free workspace is claimed and later released."""
+    os.environ.pop("SASE_GH_PRE_ALLOCATED", None)
+
+    allocated = gh_workspace.allocate_gh_workspace(
+        "alice/proj", n=None, release=True, workflow_label="gh-run"
+    )
+
+    assert allocated.workspace_num == 3
+    assert allocated.workflow_name == "gh-run"
+    assert allocated.should_release is True
+    mock_avail.assert_called_once_with("/specs/proj.gp")
+    assert mock_claim.call_args.kwargs["pinned"] is False
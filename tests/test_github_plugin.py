@@ -2,8 +2,12 @@
 
 Verifies that :class:`GitHubPlugin` works correctly when routed through
 :class:`VCSPluginManager`.
+
+Runtime here is dominated by patch setup and pluggy dispatch (I/O and
+bookkeeping, not compute); keep optimizations to fixture and mock reuse.
 """
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pluggy
@@ -15,6 +19,7 @@ from sase.vcs_provider._plugin_manager import VCSPluginManager
 from sase_github.plugin import GitHubPlugin
 
 _MOCK_TARGET = "sase.vcs_provider._command_runner.subprocess.run"
+_PR_LOOKUP_TARGET = "sase_github.gh_client.lookup_open_pr"
 
 
 @pytest.fixture
@@ -89,73 +94,150 @@ def test_plugin_commit(mock_run: MagicMock, github_provider: VCSPluginManager) -
     assert error is None
 
 
-# === Tests for GitHub-specific operations ===
+# === Tests for vcs_classify_repo ===
 
 
-@patch(_MOCK_TARGET)
-def test_plugin_get_change_url_with_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+def test_classify_repo_reads_git_config_directly(tmp_path: Path) -> None:
+    """Classification reads .git/config without forking git."""
+    from sase_github.plugin import _classify_git_dir
+
+    _classify_git_dir.cache_clear()
+    repo = tmp_path
+    (repo / ".git").mkdir()
+    (repo / ".git" / "config").write_text(
+        '[remote "origin"]\n\turl = https://github.com/user/repo.git\n'
+    )
+
+    plugin = GitHubPlugin()
+    with patch("sase_github.plugin.subprocess.run") as mock_run:
+        assert plugin.vcs_classify_repo(str(repo)) == "github"
+        mock_run.assert_not_called()
+
+
+def test_classify_repo_prefers_git_config_over_tracked_file(
+    tmp_path: Path,
+) -> None:
+    """A tracked top-level 'config' file is not mistaken for .git/config."""
+    from sase_github.plugin import _classify_git_dir
+
+    _classify_git_dir.cache_clear()
+    repo = tmp_path
+    (repo / ".git").mkdir()
+    (repo / ".git" / "config").write_text(
+        '[remote "origin"]\n\turl = https://github.com/user/repo.git\n'
+    )
+    (repo / "config").write_text(
+        '[remote "origin"]\n\turl = https://gitlab.com/user/repo.git\n'
+    )
+
+    plugin = GitHubPlugin()
+    assert plugin.vcs_classify_repo(str(repo)) == "github"
+
+
+@patch("sase_github.plugin.subprocess.run")
+def test_classify_repo_tracked_config_falls_back_to_git(
+    mock_run: MagicMock, tmp_path: Path
 ) -> None:
+    """A top-level 'config' without a sibling HEAD defers to the git CLI."""
+    from sase_github.plugin import _classify_git_dir
+
+    _classify_git_dir.cache_clear()
+    (tmp_path / "config").write_text(
+        '[remote "origin"]\n\turl = https://github.com/user/repo.git\n'
+    )
     mock_run.return_value = MagicMock(
-        returncode=0, stdout="https://github.com/user/repo/pull/42\n", stderr=""
+        returncode=0, stdout=b"https://gitlab.com/user/repo.git\n"
     )
+
+    plugin = GitHubPlugin()
+    assert plugin.vcs_classify_repo(str(tmp_path)) is None
+    mock_run.assert_called_once()
+
+
+@patch("sase_github.plugin.subprocess.run")
+def test_classify_repo_cached_per_git_dir(mock_run: MagicMock) -> None:
+    """Repeat classifications of the same directory don't re-fork git."""
+    from sase_github.plugin import _classify_git_dir
+
+    _classify_git_dir.cache_clear()
+    mock_run.return_value = MagicMock(
+        returncode=0, stdout=b"https://github.com/user/repo.git\n"
+    )
+
+    plugin = GitHubPlugin()
+    assert plugin.vcs_classify_repo("/workspace") == "github"
+    assert plugin.vcs_classify_repo("/workspace") == "github"
+    assert mock_run.call_count == 1
+
+
+# === Tests for GitHub-specific operations ===
+
+
+@patch(_PR_LOOKUP_TARGET)
+def test_plugin_get_change_url_with_pr(
+    mock_lookup: MagicMock, github_provider: VCSPluginManager
+) -> None:
+    mock_lookup.return_value = {
+        "number": 42,
+        "html_url": "https://github.com/user/repo/pull/42",
+    }
     success, url = github_provider.get_change_url("/workspace")
 
     assert success is True
     assert url == "https://github.com/user/repo/pull/42"
 
 
-@patch(_MOCK_TARGET)
+@patch(_PR_LOOKUP_TARGET)
 def test_plugin_get_change_url_no_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+    mock_lookup: MagicMock, github_provider: VCSPluginManager
 ) -> None:
-    mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="no PR")
+    mock_lookup.return_value = None
     success, url = github_provider.get_change_url("/workspace")
 
     assert success is True
     assert url is None
 
 
-@patch(_MOCK_TARGET)
+@patch(_PR_LOOKUP_TARGET)
 def test_plugin_get_cl_number_with_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+    mock_lookup: MagicMock, github_provider: VCSPluginManager
 ) -> None:
-    mock_run.return_value = MagicMock(returncode=0, stdout="42\n", stderr="")
+    mock_lookup.return_value = {
+        "number": 42,
+        "html_url": "https://github.com/user/repo/pull/42",
+    }
     success, number = github_provider.get_cl_number("/workspace")
 
     assert success is True
     assert number == "42"
 
 
-@patch(_MOCK_TARGET)
+@patch(_PR_LOOKUP_TARGET)
 def test_plugin_get_cl_number_no_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+    mock_lookup: MagicMock, github_provider: VCSPluginManager
 ) -> None:
-    mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="no PR")
+    mock_lookup.return_value = None
     success, number = github_provider.get_cl_number("/workspace")
 
     assert success is True
     assert number is None
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
 def test_plugin_mail_creates_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+    mock_run: MagicMock,
+    mock_lookup: MagicMock,
+    github_provider: VCSPluginManager,
 ) -> None:
-    """mail pushes and creates a PR when none exists."""
-    # First call: git push (success)
-    # Second call: gh pr view (fail = no existing PR)
-    # Third call: gh pr create (success)
-    mock_run.side_effect = [
-        MagicMock(returncode=0, stdout="", stderr=""),
-        MagicMock(returncode=1, stdout="", stderr="no PR"),
-        MagicMock(returncode=0, stdout="", stderr=""),
-    ]
+    """mail pushes and then creates a PR when none exists."""
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    mock_lookup.return_value = None
     success, error = github_provider.mail("feature-branch", "/workspace")
 
     assert success is True
     assert error is None
-    assert mock_run.call_count == 3
+    assert mock_run.call_count == 2
     assert mock_run.call_args_list[0][0][0] == [
         "git",
         "push",
@@ -163,23 +245,31 @@ def test_plugin_mail_creates_pr(
         "origin",
         "feature-branch",
     ]
-    assert mock_run.call_args_list[2][0][0] == ["gh", "pr", "create", "--fill"]
+    assert mock_run.call_args_list[1][0][0] == ["gh", "pr", "create", "--fill"]
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
 def test_plugin_mail_existing_pr(
-    mock_run: MagicMock, github_provider: VCSPluginManager
+    mock_run: MagicMock,
+    mock_lookup: MagicMock,
+    github_provider: VCSPluginManager,
 ) -> None:
     """mail pushes but skips PR creation when PR already exists."""
-    mock_run.side_effect = [
-        MagicMock(returncode=0, stdout="", stderr=""),  # git push
-        MagicMock(returncode=0, stdout="42\n", stderr=""),  # gh pr view (PR exists)
-    ]
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")  # git push
+    mock_lookup.return_value = {"number": 42}
     success, error = github_provider.mail("feature-branch", "/workspace")
 
     assert success is True
     assert error is None
-    assert mock_run.call_count == 2
+    assert mock_run.call_count == 1
+    assert mock_run.call_args[0][0] == [
+        "git",
+        "push",
+        "-u",
+        "origin",
+        "feature-branch",
+    ]
 
 
 # === Tests for prepare_description_for_reword ===
@@ -196,113 +286,156 @@ def test_plugin_prepare_description_passthrough(
 # === Direct plugin method tests (GitHub-specific) ===
 
 
-@patch(_MOCK_TARGET)
-def test_direct_get_change_url_with_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_get_change_url when PR exists."""
-    mock_run.return_value = MagicMock(
-        returncode=0,
-        stdout="https://github.com/user/repo/pull/42\n",
-        stderr="",
-    )
+_PR = {
+    "number": 42,
+    "html_url": "https://github.com/user/repo/pull/42",
+}
+
+
+@pytest.mark.parametrize(
+    ("method", "lookup", "expected"),
+    [
+        ("vcs_get_change_url", _PR, "https://github.com/user/repo/pull/42"),
+        ("vcs_get_change_url", None, None),
+        ("vcs_get_cl_number", _PR, "42"),
+        ("vcs_get_cl_number", None, None),
+    ],
+)
+@patch(_PR_LOOKUP_TARGET)
+def test_direct_pr_lookup_methods(
+    mock_lookup: MagicMock,
+    method: str,
+    lookup: dict | None,
+    expected: str | None,
+) -> None:
+    """vcs_get_change_url / vcs_get_cl_number read the shared PR lookup."""
+    mock_lookup.return_value = lookup
 
     plugin = GitHubPlugin()
-    success, url = plugin.vcs_get_change_url("/workspace")
+    success, value = getattr(plugin, method)("/workspace")
 
     assert success is True
-    assert url == "https://github.com/user/repo/pull/42"
+    assert value == expected
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_get_change_url_no_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_get_change_url when no PR exists."""
-    mock_run.return_value = MagicMock(
-        returncode=1, stdout="", stderr="no pull requests found"
-    )
+def test_direct_mail_push_and_create_pr(
+    mock_run: MagicMock, mock_lookup: MagicMock
+) -> None:
+    """Test GitHubPlugin.vcs_mail pushes and then creates when none exists."""
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    mock_lookup.return_value = None
 
     plugin = GitHubPlugin()
-    success, url = plugin.vcs_get_change_url("/workspace")
+    success, error = plugin.vcs_mail("feature-branch", "/workspace")
 
     assert success is True
-    assert url is None
+    assert error is None
+    assert mock_run.call_count == 2
+    assert mock_run.call_args_list[0][0][0] == [
+        "git",
+        "push",
+        "-u",
+        "origin",
+        "feature-branch",
+    ]
+    assert mock_run.call_args_list[1][0][0] == ["gh", "pr", "create", "--fill"]
 
 
+@patch("sase_github.gh_client.invalidate_pr_lookup")
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_get_cl_number_with_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_get_cl_number when PR exists."""
-    mock_run.return_value = MagicMock(returncode=0, stdout="42\n", stderr="")
+def test_direct_mail_create_invalidates_pr_lookup(
+    mock_run: MagicMock, mock_lookup: MagicMock, mock_invalidate: MagicMock
+) -> None:
+    """A successful PR create evicts the memoized None lookup."""
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    mock_lookup.return_value = None
 
     plugin = GitHubPlugin()
-    success, number = plugin.vcs_get_cl_number("/workspace")
+    success, _ = plugin.vcs_mail("feature-branch", "/workspace")
 
     assert success is True
-    assert number == "42"
+    mock_invalidate.assert_called_once()
 
 
+@patch("sase_github.gh_client.invalidate_pr_lookup")
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_get_cl_number_no_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_get_cl_number when no PR exists."""
-    mock_run.return_value = MagicMock(
-        returncode=1, stdout="", stderr="no pull requests found"
-    )
+def test_direct_mail_failed_create_keeps_pr_lookup(
+    mock_run: MagicMock, mock_lookup: MagicMock, mock_invalidate: MagicMock
+) -> None:
+    """A failed PR create leaves the lookup memo alone."""
+    mock_run.side_effect = [
+        MagicMock(returncode=0, stdout="", stderr=""),
+        MagicMock(returncode=1, stdout="", stderr="denied"),
+    ]
+    mock_lookup.return_value = None
 
     plugin = GitHubPlugin()
-    success, number = plugin.vcs_get_cl_number("/workspace")
+    success, _ = plugin.vcs_mail("feature-branch", "/workspace")
 
-    assert success is True
-    assert number is None
+    assert success is False
+    mock_invalidate.assert_not_called()
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_mail_push_and_create_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_mail pushes and creates PR when none exists."""
-    mock_run.side_effect = [
-        MagicMock(returncode=0, stdout="", stderr=""),  # git push
-        MagicMock(returncode=1, stdout="", stderr="no PR"),  # gh pr view (no PR)
-        MagicMock(returncode=0, stdout="", stderr=""),  # gh pr create
-    ]
+def test_direct_mail_push_existing_pr(
+    mock_run: MagicMock, mock_lookup: MagicMock
+) -> None:
+    """Test GitHubPlugin.vcs_mail just pushes when PR already exists."""
+    mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")  # git push
+    mock_lookup.return_value = {"number": 42}
 
     plugin = GitHubPlugin()
     success, error = plugin.vcs_mail("feature-branch", "/workspace")
 
     assert success is True
     assert error is None
-    assert mock_run.call_count == 3
-    assert mock_run.call_args_list[0][0][0] == [
+    assert mock_run.call_count == 1
+    assert mock_run.call_args[0][0] == [
         "git",
         "push",
         "-u",
         "origin",
         "feature-branch",
     ]
-    assert mock_run.call_args_list[2][0][0] == ["gh", "pr", "create", "--fill"]
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_mail_push_existing_pr(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_mail just pushes when PR already exists."""
-    mock_run.side_effect = [
-        MagicMock(returncode=0, stdout="", stderr=""),  # git push
-        MagicMock(returncode=0, stdout="42\n", stderr=""),  # gh pr view (PR exists)
-    ]
+def test_direct_mail_push_fails(mock_run: MagicMock, mock_lookup: MagicMock) -> None:
+    """Test GitHubPlugin.vcs_mail when push fails."""
+    mock_run.return_value = MagicMock(
+        returncode=1, stdout="", stderr="permission denied"
+    )
+    mock_lookup.return_value = {"number": 42}
 
     plugin = GitHubPlugin()
     success, error = plugin.vcs_mail("feature-branch", "/workspace")
 
-    assert success is True
-    assert error is None
-    assert mock_run.call_count == 2
+    assert success is False
+    assert error is not None
+    assert "git push failed" in error
 
 
+@patch(_PR_LOOKUP_TARGET)
 @patch(_MOCK_TARGET)
-def test_direct_mail_push_fails(mock_run: MagicMock) -> None:
-    """Test GitHubPlugin.vcs_mail when push fails."""
-    mock_run.return_value = MagicMock(
-        returncode=1, stdout="", stderr="permission denied"
-    )
+def test_direct_mail_create_fails(
+    mock_run: MagicMock, mock_lookup: MagicMock
+) -> None:
+    """Test GitHubPlugin.vcs_mail when the push succeeds but create fails."""
+    mock_run.side_effect = [
+        MagicMock(returncode=0, stdout="", stderr=""),
+        MagicMock(returncode=1, stdout="", stderr="permission denied"),
+    ]
+    mock_lookup.return_value = None
 
     plugin = GitHubPlugin()
     success, error = plugin.vcs_mail("feature-branch", "/workspace")
 
     assert success is False
     assert error is not None
-    assert "git push failed" in error
+    assert "gh pr create failed" in error
@@ -1,29 +1,75 @@
-"""Tests for sase_github.workspace_plugin module (GitHub-specific functions)."""
+"""Tests for sase_github.workspace_plugin module (GitHub-specific functions).
 
-import os
-import tempfile
+These tests are I/O-bound: wall time goes to mock.patch setup and temp
+file/directory syscalls, not computation. Speedups come from fixture
+reuse and avoiding real filesystem writes, nothing fancier.
+"""
+
+from collections.abc import Iterator
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
 
 from sase_github.workspace_plugin import (
     GitHubWorkspacePlugin,
+    _changespecs_by_name,
+    _default_branch_cached,
+    _detect_workflow_type,
+    _git_repo_info,
+    _load_git_config,
+    _parse_workspace_dir_at,
     resolve_gh_ref,
 )
 
+# Patch targets interned once, matching the _MOCK_TARGET convention in
+# test_github_plugin.py.
+_WS_MOD = "sase_github.workspace_plugin"
+_P_BRANCH = f"{_WS_MOD}.get_default_branch"
+_P_SET_WS = f"{_WS_MOD}.set_workspace_dir"
+_P_PARSE_WS = f"{_WS_MOD}.parse_workspace_dir"
+_P_ISDIR = f"{_WS_MOD}.os.path.isdir"
+_P_RUN = f"{_WS_MOD}.subprocess.run"
+_P_FIND_SPECS = "sase.ace.changespec.find_all_changespecs"
+
+
+def _make_changespec(**overrides: object) -> SimpleNamespace:
+    """Changespec stand-in built from shared defaults plus overrides."""
+    defaults: dict[str, object] = {
+        "name": "my-feature",
+        "file_path": "/specs/proj.gp",
+        "project_basename": "proj",
+    }
+    return SimpleNamespace(**{**defaults, **overrides})
+
 
 class TestResolveGhRef:
-    @patch("sase_github.workspace_plugin.get_default_branch", return_value="origin/main")
-    @patch("sase_github.workspace_plugin.set_workspace_dir", return_value=True)
-    @patch("sase_github.workspace_plugin.parse_workspace_dir", return_value=None)
-    @patch("sase_github.workspace_plugin.os.path.isdir", return_value=True)
+    @pytest.fixture(autouse=True)
+    def _clear_caches(self) -> None:
+        """Reset path-keyed caches: fake-fs paths repeat across tests."""
+        _changespecs_by_name.cache_clear()
+        _default_branch_cached.cache_clear()
+        _parse_workspace_dir_at.cache_clear()
+
+    @pytest.fixture(autouse=True)
+    def mock_branch(self) -> Iterator[MagicMock]:
+        """One shared default-branch patch instead of four stacked ones."""
+        with patch(
+            _P_BRANCH,
+            return_value="origin/main",
+        ) as mock:
+            yield mock
+
+    @patch(_P_SET_WS, return_value=True)
+    @patch(_P_PARSE_WS, return_value=None)
+    @patch(_P_ISDIR, return_value=True)
     def test_repo_path(
         self,
         mock_isdir: MagicMock,
         mock_parse: MagicMock,
         mock_set: MagicMock,
-        mock_branch: MagicMock,
     ) -> None:
         result = resolve_gh_ref("alice/myrepo")
         assert result.project_name == "myrepo"
@@ -31,89 +77,62 @@ class TestResolveGhRef:
         assert "alice/myrepo" in result.primary_workspace_dir
         mock_set.assert_called_once()
 
-    @patch("sase_github.workspace_plugin.get_default_branch", return_value="origin/main")
-    @patch("sase_github.workspace_plugin.set_workspace_dir", return_value=True)
-    @patch("sase_github.workspace_plugin.parse_workspace_dir")
+    @patch(_P_SET_WS, return_value=True)
+    @patch(_P_PARSE_WS)
     def test_repo_path_conflict(
         self,
         mock_parse: MagicMock,
         mock_set: MagicMock,
-        mock_branch: MagicMock,
     ) -> None:
         mock_parse.return_value = "/some/other/path/"
         with pytest.raises(ValueError, match="WORKSPACE_DIR conflict"):
             resolve_gh_ref("alice/myrepo")
 
-    @patch("sase_github.workspace_plugin.get_default_branch", return_value="origin/main")
-    def test_project_shorthand(self, mock_branch: MagicMock) -> None:
-        with tempfile.TemporaryDirectory() as d:
-            with patch("sase_github.workspace_plugin.Path.home", return_value=Path(d)):
-                proj_dir = os.path.join(d, ".sase", "projects", "myproj")
-                os.makedirs(proj_dir)
-                gp = os.path.join(proj_dir, "myproj.gp")
-                with open(gp, "w") as f:
-                    f.write("WORKSPACE_DIR: /work/myproj/\nNAME: cl\n")
-
-                result = resolve_gh_ref("myproj")
-                assert result.project_name == "myproj"
-                assert result.primary_workspace_dir == "/work/myproj/"
-                assert result.checkout_target == "origin/main"
-
-    @patch("sase_github.workspace_plugin.get_default_branch", return_value="origin/main")
-    @patch("sase.ace.changespec.find_all_changespecs")
+    def test_project_shorthand(self, fs: FakeFilesystem) -> None:
+        root = Path("/home/user/.sase")
+        fs.create_file(
+            root / "projects" / "myproj" / "myproj.gp",
+            contents="WORKSPACE_DIR: /work/myproj/\nNAME: cl\n",
+        )
+
+        result = resolve_gh_ref("myproj", sase_root=root)
+        assert result.project_name == "myproj"
+        assert result.primary_workspace_dir == "/work/myproj/"
+        assert result.checkout_target == "origin/main"
+
+    @patch(_P_FIND_SPECS)
     def test_changespec_name(
         self,
         mock_find: MagicMock,
-        mock_branch: MagicMock,
+        fs: FakeFilesystem,
     ) -> None:
-        with tempfile.TemporaryDirectory() as d:
-            gp = os.path.join(d, "proj.gp")
-            with open(gp, "w") as f:
-                f.write("WORKSPACE_DIR: /work/proj/\nNAME: my-feature\n")
-
-            cs = MagicMock()
-            cs.name = "my-feature"
-            cs.file_path = gp
-            cs.project_basename = "proj"
-            mock_find.return_value = [cs]
-
-            # Need to fail mode 2 (project shorthand) first
-            with patch(
-                "sase_github.workspace_plugin.Path.home",
-                return_value=Path("/nonexistent"),
-            ):
-                result = resolve_gh_ref("my-feature")
-                assert result.checkout_target == "origin/my-feature"
-                assert result.project_name == "proj"
-
-    @patch("sase.ace.changespec.find_all_changespecs")
-    def test_changespec_no_workspace_dir(self, mock_find: MagicMock) -> None:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".gp", delete=False) as f:
-            f.write("NAME: my-feature\n")
-            f.flush()
-
-            cs = MagicMock()
-            cs.name = "my-feature"
-            cs.file_path = f.name
-            cs.project_basename = "proj"
-            mock_find.return_value = [cs]
-
-            with patch(
-                "sase_github.workspace_plugin.Path.home",
-                return_value=Path("/nonexistent"),
-            ):
-                with pytest.raises(ValueError, match="WORKSPACE_DIR is not set"):
-                    resolve_gh_ref("my-feature")
-            os.unlink(f.name)
-
-    @patch("sase.ace.changespec.find_all_changespecs", return_value=[])
-    def test_not_found(self, mock_find: MagicMock) -> None:
-        with patch(
-            "sase_github.workspace_plugin.Path.home",
-            return_value=Path("/nonexistent"),
-        ):
-            with pytest.raises(ValueError, match="Cannot resolve"):
-                resolve_gh_ref("unknown-thing")
+        # Mode 2 (project shorthand) fails naturally: the fake fs has
+        # no ~/.sase tree.
+        gp = "/specs/proj.gp"
+        fs.create_file(gp, contents="WORKSPACE_DIR: /work/proj/\nNAME: my-feature\n")
+
+        mock_find.return_value = [_make_changespec(file_path=gp)]
+
+        result = resolve_gh_ref("my-feature")
+        assert result.checkout_target == "origin/my-feature"
+        assert result.project_name == "proj"
+
+    @patch(_P_FIND_SPECS)
+    def test_changespec_no_workspace_dir(
+        self, mock_find: MagicMock, fs: FakeFilesystem
+    ) -> None:
+        gp = "/specs/proj.gp"
+        fs.create_file(gp, contents="NAME: my-feature\n")
+
+        mock_find.return_value = [_make_changespec(file_path=gp)]
+
+        with pytest.raises(ValueError, match="WORKSPACE_DIR is not set"):
+            resolve_gh_ref("my-feature")
+
+    @patch(_P_FIND_SPECS, return_value=[])
+    def test_not_found(self, mock_find: MagicMock, fs: FakeFilesystem) -> None:
+        with pytest.raises(ValueError, match="Cannot resolve"):
+            resolve_gh_ref("unknown-thing")
 
     def test_invalid_repo_path(self) -> None:
         with pytest.raises(ValueError, match="expected 'user/project'"):
@@ -124,57 +143,77 @@ class TestResolveGhRef:
 
 
 class TestDetectWorkflowTypeForProject:
-    def test_hg_no_git(self) -> None:
+    @pytest.fixture(autouse=True)
+    def _clear_caches(self) -> None:
+        """The shared fixture path repeats across tests; reset path caches."""
+        _detect_workflow_type.cache_clear()
+        _git_repo_info.cache_clear()
+        _load_git_config.cache_clear()
+        _parse_workspace_dir_at.cache_clear()
+
+    @pytest.fixture
+    def plugin(self) -> GitHubWorkspacePlugin:
+        return GitHubWorkspacePlugin()
+
+    def test_hg_no_git(
+        self, plugin: GitHubWorkspacePlugin, tmp_path: Path
+    ) -> None:
         """Returns None when no WORKSPACE_DIR or no .git directory."""
-        plugin = GitHubWorkspacePlugin()
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".gp", delete=False) as f:
-            f.write("NAME: cl\n")
-            f.flush()
-            assert plugin.ws_detect_workflow_type(project_file=f.name) is None
-            os.unlink(f.name)
-
-    @patch("sase_github.workspace_plugin.subprocess.run")
-    def test_git_bare_repo_dir_set(self, mock_run: MagicMock) -> None:
+        gp = tmp_path / "proj.gp"
+        gp.write_text("NAME: cl\n")
+        assert plugin.ws_detect_workflow_type(project_file=str(gp)) is None
+
+    @patch(_P_RUN)
+    def test_git_bare_repo_dir_set(
+        self, mock_run: MagicMock, plugin: GitHubWorkspacePlugin, tmp_path: Path
+    ) -> None:
         """Returns None when BARE_REPO_DIR is set in project file."""
-        plugin = GitHubWorkspacePlugin()
-        with tempfile.TemporaryDirectory() as d:
-            workspace = os.path.join(d, "repo")
-            os.makedirs(os.path.join(workspace, ".git"))
-            gp = os.path.join(d, "proj.gp")
-            with open(gp, "w") as f:
-                f.write(
-                    f"WORKSPACE_DIR: {workspace}\n"
-                    "BARE_REPO_DIR: /repos/proj.git\n"
-                    "NAME: cl\n"
-                )
-            assert plugin.ws_detect_workflow_type(project_file=gp) is None
-
-    @patch("sase_github.workspace_plugin.subprocess.run")
-    def test_git_local_origin_url(self, mock_run: MagicMock) -> None:
-        """Returns None when origin remote URL is a local path."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout="/home/user/repos/proj.git\n"
+        workspace = tmp_path / "repo"
+        (workspace / ".git").mkdir(parents=True)
+        gp = tmp_path / "proj.gp"
+        gp.write_text(
+            f"WORKSPACE_DIR: {workspace}\n"
+            "BARE_REPO_DIR: /repos/proj.git\n"
+            "NAME: cl\n"
         )
-        plugin = GitHubWorkspacePlugin()
-        with tempfile.TemporaryDirectory() as d:
-            workspace = os.path.join(d, "repo")
-            os.makedirs(os.path.join(workspace, ".git"))
-            gp = os.path.join(d, "proj.gp")
-            with open(gp, "w") as f:
-                f.write(f"WORKSPACE_DIR: {workspace}\nNAME: cl\n")
-            assert plugin.ws_detect_workflow_type(project_file=gp) is None
-
-    @patch("sase_github.workspace_plugin.subprocess.run")
-    def test_gh_github_origin_url(self, mock_run: MagicMock) -> None:
+        assert plugin.ws_detect_workflow_type(project_file=str(gp)) is None
+
+    @patch(_P_RUN)
+    def test_git_local_origin_url(
+        self,
+        mock_run: MagicMock,
+        plugin: GitHubWorkspacePlugin,
+        cl_gp_file: tuple[str, str],
+    ) -> None:
+        """Returns None when origin remote URL is a local path."""
+        gp, workspace = cl_gp_file
+        mock_run.side_effect = [
+            SimpleNamespace(
+                returncode=0, stdout=f"{workspace}/.git\n{workspace}\n"
+            ),
+            SimpleNamespace(
+                returncode=0,
+                stdout="remote.origin.url\n/home/user/repos/proj.git\0",
+            ),
+        ]
+        assert plugin.ws_detect_workflow_type(project_file=gp) is None
+
+    @patch(_P_RUN)
+    def test_gh_github_origin_url(
+        self,
+        mock_run: MagicMock,
+        plugin: GitHubWorkspacePlugin,
+        cl_gp_file: tuple[str, str],
+    ) -> None:
         """Returns 'gh' when origin remote URL is a GitHub URL."""
-        mock_run.return_value = MagicMock(
-            returncode=0, stdout="https://github.com/user/repo.git\n"
-        )
-        plugin = GitHubWorkspacePlugin()
-        with tempfile.TemporaryDirectory() as d:
-            workspace = os.path.join(d, "repo")
-            os.makedirs(os.path.join(workspace, ".git"))
-            gp = os.path.join(d, "proj.gp")
-            with open(gp, "w") as f:
-                f.write(f"WORKSPACE_DIR: {workspace}\nNAME: cl\n")
-            assert plugin.ws_detect_workflow_type(project_file=gp) == "gh"
+        gp, workspace = cl_gp_file
+        mock_run.side_effect = [
+            SimpleNamespace(
+                returncode=0, stdout=f"{workspace}/.git\n{workspace}\n"
+            ),
+            SimpleNamespace(
+                returncode=0,
+                stdout="remote.origin.url\nhttps://github.com/user/repo.git\0",
+            ),
+        ]
+        assert plugin.ws_detect_workflow_type(project_file=gp) == "gh"